@@ -1,6 +1,6 @@
-from mp_api.client import MPRester
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import warnings as warning
 
@@ -23,10 +23,19 @@ def write_file(file_path, content, safe=True):
     """
     Write content to a file. If safe is True, do not overwrite existing files.
     """
-    if safe and Path(file_path).exists():
-        warning.warn(f"File {file_path} already exists. Skipping write.")
-    with open(file_path, "w") as f:
-        f.write(content)
+    data = content.encode("utf-8")
+    if safe:
+        try:
+            fd = os.open(
+                file_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644
+            )
+        except FileExistsError:
+            warning.warn(f"File {file_path} already exists. Skipping write.")
+            return
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+    else:
+        Path(file_path).write_bytes(data)
 
 
 def fetch_structure_file(chemsys_formula_mpid, dest_dir):
@@ -44,11 +53,16 @@ def fetch_structure_file(chemsys_formula_mpid, dest_dir):
     dest_dir : str
         Directory to save the fetched structure files.
     """
+    # Imported here so loading io_tools does not drag in mp_api's
+    # dependency chain (requests, pymatgen, ...).
+    from mp_api.client import MPRester
+
     with MPRester() as mpr:
         entries = mpr.get_entries(chemsys_formula_mpid)
 
-    for entry in entries:
-        structure = entry.structure
-        filename = f"{entry.entry_id}.cif"
-        file_path = Path(dest_dir) / filename
-        structure.to(filename=str(file_path))
+    def write_entry(entry):
+        file_path = Path(dest_dir) / f"{entry.entry_id}.cif"
+        entry.structure.to(filename=str(file_path))
+
+    with ThreadPoolExecutor() as executor:
+        list(executor.map(write_entry, entries))
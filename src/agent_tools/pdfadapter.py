@@ -9,12 +9,113 @@ from diffpy.srfit.fitbase import (
 )
 from diffpy.srfit.pdf import PDFGenerator
 import numpy
-import warnings
 from pathlib import Path
 from scipy.optimize import least_squares
 from typing import Literal
+import atexit
+import copy
+import functools
 import json
+import os
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Pool
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+_NCPU = None
+_POOL = None
+
+if numba is not None:
+    # Compiled against a fixed signature so the first residual call does
+    # not pay the JIT cost; cache=True persists the compilation on disk.
+    @numba.njit(
+        "float64[::1](float64, float64[::1], float64[:, ::1])",
+        cache=True,
+        fastmath=True,
+    )
+    def _mix_kernel(s0, weights, generators):
+        accumulated = numpy.zeros(generators.shape[1])
+        for i in range(weights.shape[0]):
+            accumulated += weights[i] * generators[i]
+        return s0 * accumulated
+
+else:
+    _mix_kernel = None
+
+
+def _get_pool():
+    """
+    Return the shared multiprocessing pool, creating it on first use.
+
+    The worker count is taken from the PDFADAPTER_NCPU environment
+    variable, defaulting to os.cpu_count() - 1.
+    """
+    global _NCPU, _POOL
+    if _POOL is None:
+        _NCPU = int(
+            os.environ.get(
+                "PDFADAPTER_NCPU", max(1, (os.cpu_count() or 2) - 1)
+            )
+        )
+        _POOL = Pool(processes=_NCPU)
+        atexit.register(_POOL.close)
+    return _POOL
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_cif(path_str, mtime):
+    """
+    Parse a CIF file, cached on (path, mtime) so repeated
+    init_structures calls on an unchanged file skip re-parsing.
+    """
+    stru_parser = getParser("cif")
+    structure = stru_parser.parseFile(path_str)
+    sg = getattr(stru_parser, "spacegroup", None)
+    spacegroup = sg.short_name if sg is not None else "P1"
+    return structure, spacegroup
+
+
+def _parse_structure(structure_path):
+    """
+    Parse one CIF file and return (structure, spacegroup short name).
+    """
+    path_str = str(structure_path)
+    structure, spacegroup = _parse_cif(path_str, os.path.getmtime(path_str))
+    # Copy so the caller's PDFGenerator cannot mutate the cached object.
+    return copy.deepcopy(structure), spacegroup
+
+
+def _make_weighted_mix(number_of_phase):
+    """
+    Build the mixing function registered on the contribution.
+
+    The returned function computes
+    s0 * (s1*G1 + ... + (1 - sum(si))*Gn) as a single dot product over
+    the stacked generator arrays instead of srfit evaluating one
+    equation node per phase.
+    """
+
+    # Allocated once; every residual call only fills it in place.
+    full_weights = numpy.empty(number_of_phase)
+
+    def weighted_mix(s0, *args):
+        for i in range(number_of_phase - 1):
+            full_weights[i] = args[i]
+        full_weights[-1] = 1.0 - full_weights[:-1].sum()
+        generators = numpy.stack(args[number_of_phase - 1 :])
+        if _mix_kernel is not None:
+            return _mix_kernel(
+                float(s0),
+                full_weights,
+                numpy.ascontiguousarray(generators, dtype=float),
+            )
+        return s0 * numpy.tensordot(full_weights, generators, axes=1)
+
+    return weighted_mix
 
 
 class PDFAdapter:
@@ -33,17 +134,14 @@ class PDFAdapter:
 
     Methods
     -------
-    load_inputs(inputs)
-        Load inputs to initialize the adapter.
-    apply_parameter_values(pv_dict)
+    set_initial_variable_values(variable_name_to_value)
         Update parameter values from the provided dictionary.
-    get_parameter_values()
-        Get current parameter values as a dictionary.
-    show_parameters()
-        Show current parameter values and their fix/free status.
-    apply_action()
-        Generate operations to be performed in the workflow.
-    generate_observation()
+    refine_variables(variable_names)
+        Refine the named variables in order.
+    get_parameter_names()
+        Get the names of all parameters in the recipe.
+    save_results(mode, filename)
+        Save the fitting results.
     """
 
     required_keys = [
@@ -52,7 +150,9 @@ class PDFAdapter:
     ]
 
     def __init__(self):
-        pass
+        # (id(parset), spacegroup) -> (parset, SpaceGroupParameters); the
+        # parset reference keeps the id stable for the cache lifetime.
+        self._sg_cache = {}
 
     def init_profile(
         self,
@@ -88,7 +188,7 @@ class PDFAdapter:
         """
         profile = Profile()
         parser = PDFParser()
-        parser.parseString(Path(profile_path).read_text())
+        parser.parseFile(str(profile_path))
         profile.loadParsedData(parser)
         if qmin:
             profile.meta["qmin"] = qmin
@@ -97,6 +197,45 @@ class PDFAdapter:
         profile.setCalculationRange(xmin=xmin, xmax=xmax, dx=dx)
         self.profile = profile
 
+    def reset_profile(
+        self,
+        profile_path: str,
+        qmin=None,
+        qmax=None,
+        xmin=None,
+        xmax=None,
+        dx=None,
+    ):
+        """
+        Swap in a new experimental profile without rebuilding the recipe.
+
+        In sequential fitting only the profile changes between data files,
+        so the FitRecipe, PDFGenerator objects, and their symmetry
+        constraints can be reused. This method loads a fresh profile and
+        attaches it to the existing contribution.
+
+        Must be called after init_contribution.
+
+        Parameters
+        ----------
+        profile_path : str
+            The path to the experimental PDF profile file.
+        qmin : float, optional
+            The minimum Q value for PDF calculation. Default is None.
+        qmax : float, optional
+            The maximum Q value for PDF calculation. Default is None.
+        xmin : float, optional
+            The minimum r value for PDF calculation. Default is None.
+        xmax : float, optional
+            The maximum r value for PDF calculation. Default is None.
+        dx : float, optional
+            The r step size for PDF calculation. Default is None.
+        """
+        self.init_profile(
+            profile_path, qmin=qmin, qmax=qmax, xmin=xmin, xmax=xmax, dx=dx
+        )
+        self.contribution.setProfile(self.profile)
+
     def init_structures(self, structure_paths: list[str], run_parallel=True):
         """
         Load and initialize the structures from the given file paths, and
@@ -122,41 +261,33 @@ class PDFAdapter:
         """
         if isinstance(structure_paths, str):
             structure_paths = [structure_paths]
-        structures = []
         spacegroups = []
         pdfgenerators = []
+
+        if len(structure_paths) > 1:
+            with ThreadPoolExecutor(
+                max_workers=len(structure_paths)
+            ) as executor:
+                parsed = list(executor.map(_parse_structure, structure_paths))
+        else:
+            parsed = [_parse_structure(structure_paths[0])]
+
         if run_parallel:
-            try:
-                import psutil
-                import multiprocessing
-                from multiprocessing import Pool
-
-                syst_cores = multiprocessing.cpu_count()
-                cpu_percent = psutil.cpu_percent()
-                avail_cores = numpy.floor(
-                    (100 - cpu_percent) / (100.0 / syst_cores)
-                )
-                ncpu = int(numpy.max([1, avail_cores]))
-                pool = Pool(processes=ncpu)
-                self.pool = pool
-            except ImportError:
-                warnings.warn(
-                    "\nYou don't appear to have the necessary packages for "
-                    "parallelization. Proceeding without parallelization."
-                )
-                run_parallel = False
-
-        for i, structure_path in enumerate(structure_paths):
-            stru_parser = getParser("cif")
-            structure = stru_parser.parse(Path(structure_path).read_text())
-            sg = getattr(stru_parser, "spacegroup", None)
-            spacegroup = sg.short_name if sg is not None else "P1"
-            structures.append(structure)
+            # Pool startup (fork plus a diffpy import per worker) costs
+            # more than it saves on one small Debye sum; stay serial for
+            # a lone small structure.
+            run_parallel = len(parsed) > 1 or len(parsed[0][0]) > 50
+        if run_parallel:
+            self.pool = _get_pool()
+
+        # PDFGenerator construction registers srfit objects and is kept
+        # serial; only the independent CIF parsing runs in threads.
+        for i, (structure, spacegroup) in enumerate(parsed):
             spacegroups.append(spacegroup)
             pdfgenerator = PDFGenerator(f"G{i+1}")
             pdfgenerator.setStructure(structure)
             if run_parallel:
-                pdfgenerator.parallel(ncpu=ncpu, mapfunc=self.pool.map)
+                pdfgenerator.parallel(ncpu=_NCPU, mapfunc=self.pool.map)
             pdfgenerators.append(pdfgenerator)
         self.spacegroups = spacegroups
         self.pdfgenerators = pdfgenerators
@@ -193,14 +324,17 @@ class PDFAdapter:
             if number_of_phase == 1:
                 equation_string = "s0*G1"
             else:
-                equation_string = (
-                    "s0*("
-                    + "+".join(
-                        [f"s{i+1}*G{i+1}" for i in range(number_of_phase - 1)]
-                    )
-                    + f"+(1-({'+'.join([f's{i+1}' for i in range(1, number_of_phase)])}))*G{number_of_phase}"  # noqa: E501
-                    + ")"
+                argnames = (
+                    ["s0"]
+                    + [f"s{i+1}" for i in range(number_of_phase - 1)]
+                    + [f"G{i+1}" for i in range(number_of_phase)]
+                )
+                contribution.registerFunction(
+                    _make_weighted_mix(number_of_phase),
+                    name="mix",
+                    argnames=argnames,
                 )
+                equation_string = f"mix({', '.join(argnames)})"
         contribution.setEquation(equation_string)
         self.contribution = contribution
         return self.contribution
@@ -250,7 +384,14 @@ class PDFAdapter:
             recipe.constrain(pdfgenerator.qdamp, qdamp)
             recipe.constrain(pdfgenerator.qbroad, qbroad)
             stru_parset = pdfgenerator.phase
-            spacegroupparams = constrainAsSpaceGroup(stru_parset, spacegroup)
+            cache_key = (id(stru_parset), spacegroup)
+            if cache_key in self._sg_cache:
+                _, spacegroupparams = self._sg_cache[cache_key]
+            else:
+                spacegroupparams = constrainAsSpaceGroup(
+                    stru_parset, spacegroup
+                )
+                self._sg_cache[cache_key] = (stru_parset, spacegroupparams)
             for par in spacegroupparams.xyzpars:
                 recipe.addVar(par, name=par.name + f"_{i+1}", fixed=False)
             for par in spacegroupparams.latpars:
@@ -262,6 +403,21 @@ class PDFAdapter:
         recipe.fithooks[0].verbose = 0
         self.recipe = recipe
 
+    def close(self):
+        """
+        Shut down the shared multiprocessing pool.
+
+        Safe to call when no pool was ever created. A new pool is created
+        lazily if init_structures runs again afterwards.
+        """
+        global _NCPU, _POOL
+        if _POOL is not None:
+            _POOL.close()
+            _POOL.join()
+            _POOL = None
+            _NCPU = None
+        self.pool = None
+
     def set_initial_variable_values(self, variable_name_to_value: dict):
         """
         Update parameter values from the provided dictionary.
@@ -284,6 +440,9 @@ class PDFAdapter:
         variable_names : list of str
             The names of the variables to refine.
         """
+        # Start from an all-fixed recipe so the schedule frees variables
+        # progressively even when the recipe is reused across fits.
+        self.recipe.fix("all")
         for vname in variable_names:
             self.recipe.free(vname)
             least_squares(
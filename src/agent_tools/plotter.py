@@ -6,9 +6,6 @@ from diffpy.srfit.pdf import PDFParser
 from diffpy.srfit.fitbase import Profile
 from pathlib import Path
 from matplotlib.gridspec import GridSpec
-from pyparsing import line
-
-plt.style.use(all_styles["bg-style"])
 
 
 def get_nth_ax(axes, n):
@@ -24,6 +21,7 @@ class Plotter:
     """
 
     def __init__(self):
+        plt.style.use(all_styles["bg-style"])
         self.figures = {}
         self.colors = plt.rcParams["axes.prop_cycle"].by_key()["color"]
 
@@ -31,22 +29,9 @@ class Plotter:
         if fig_title in self.figures:
             fig = self.figures[fig_title]
             n_ax = len(fig.axes)
-            old_axes_data = []
-            for old_ax in fig.axes:
-                x_values = []
-                y_values = []
-                line = old_ax.get_lines()[0]
-                x_values = line.get_xdata()
-                y_values = line.get_ydata()
-                label = line.get_label()
-                old_axes_data.append((x_values, y_values, label))
-            fig.axes.clear()
-            fig.clf()
             gs = GridSpec(n_ax + 1, 1, figure=fig)
-            for i, (ox, oy, label) in enumerate(old_axes_data):
-                ax_old = fig.add_subplot(gs[i, 0])
-                ax_old.plot(ox, oy, label=label)
-                ax_old.set_yticks([])
+            for i, old_ax in enumerate(fig.axes):
+                old_ax.set_subplotspec(gs[i, 0])
             ax = fig.add_subplot(gs[-1, 0])
         else:
             fig, ax = plt.subplots()
@@ -1,29 +1,58 @@
-from os import name
 from pathlib import Path
+import bisect
+import os
 import re
 import json
 import threading
 from typing import Literal
 
-from requests import session
 from agent_tools.pdfadapter import PDFAdapter
 from diffpy.srfit.fitbase import FitResults
-from prompt_toolkit import PromptSession
-from prompt_toolkit.patch_stdout import patch_stdout
 from matplotlib import pyplot as plt
-from queue import Queue
+from queue import Queue, Empty
 from bg_mpl_stylesheets.styles import all_styles
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 plt.style.use(all_styles["bg-style"])
 
 
+def _start_directory_observer(directory, event_queue):
+    """
+    Start a watchdog observer that pushes newly-created file paths into
+    event_queue. Returns None when watchdog is not installed, in which
+    case the caller falls back to polling.
+    """
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return None
+
+    class _NewFileHandler(FileSystemEventHandler):
+        def on_created(self, event):
+            if not event.is_directory:
+                event_queue.put(event.src_path)
+
+    observer = Observer()
+    observer.schedule(_NewFileHandler(), str(directory), recursive=False)
+    observer.start()
+    return observer
+
+
 class SequentialPDFFitRunner:
     def __init__(self):
         self.input_files_known = []
         self.input_files_completed = []
         self.input_files_running = []
+        self._known_names = set()
+        self._known_keys = []
         self.adapter = PDFAdapter()
         self.plot_data = {}
+        self._recipe_structure_path = None
 
     def load_inputs(
         self,
@@ -59,6 +88,7 @@ class SequentialPDFFitRunner:
             "whether_plot_ycalc": whether_plot_ycalc,
             "plot_variable_names": plot_variable_names or [],
         }
+        self._order_re = re.compile(filename_order_pattern)
         if whether_plot_y and whether_plot_ycalc:
             fig, axes = plt.subplots(2, 1)
             (line,) = axes[0].plot(
@@ -120,26 +150,27 @@ class SequentialPDFFitRunner:
 
     def check_for_new_data(self):
         input_data_dir = self.inputs["input_data_dir"]
-        filename_order_pattern = self.inputs["filename_order_pattern"]
-        files = [file for file in Path(input_data_dir).glob("*")]
-        sorted_file = sorted(
-            files,
-            key=lambda file: int(
-                re.findall(filename_order_pattern, file.name)[0]
-            ),
-        )
-        if (
-            self.input_files_known
-            != sorted_file[: len(self.input_files_known)]
-        ):
-            raise RuntimeError(
-                "Wrong order to run sequential toolset is detected. "
-                "This is likely due to files appearing in the input directory "
-                "in the wrong order. Please restart the sequential toolset."
-            )
-        if self.input_files_known == sorted_file:
+        new_files = []
+        with os.scandir(input_data_dir) as entries:
+            for entry in entries:
+                if entry.name in self._known_names:
+                    continue
+                order_key = int(self._order_re.search(entry.name).group(1))
+                new_files.append((order_key, Path(entry.path)))
+        if not new_files:
             return
-        self.input_files_known = sorted_file
+        for order_key, file in sorted(new_files):
+            position = bisect.bisect_left(self._known_keys, order_key)
+            if position < len(self._known_keys):
+                raise RuntimeError(
+                    "Wrong order to run sequential toolset is detected. "
+                    "This is likely due to files appearing in the input "
+                    "directory in the wrong order. Please restart the "
+                    "sequential toolset."
+                )
+            self._known_keys.insert(position, order_key)
+            self.input_files_known.insert(position, file)
+            self._known_names.add(file.name)
         self.input_files_running = [
             f
             for f in self.input_files_known
@@ -161,9 +192,12 @@ class SequentialPDFFitRunner:
         last_result_file = input_filename_to_result_filename(
             self.input_files_completed[-1]
         )
-        last_result_variables_values = json.load(open(last_result_file, "r"))[
-            "variables"
-        ]
+        result_bytes = Path(last_result_file).read_bytes()
+        if orjson is not None:
+            last_result = orjson.loads(result_bytes)
+        else:
+            last_result = json.loads(result_bytes)
+        last_result_variables_values = last_result["variables"]
         last_result_variables_values = {
             name: pack["value"]
             for name, pack in last_result_variables_values.items()
@@ -182,19 +216,32 @@ class SequentialPDFFitRunner:
         initial_variable_values = self.inputs["initial_variable_values"]
         refine_variable_names = self.inputs["refine_variable_names"]
         if not self.input_files_running:
-            return None
+            return 0
         for input_file in self.input_files_running:
-            self.adapter.init_profile(
-                str(input_file),
-                xmin=xmin,
-                xmax=xmax,
-                dx=dx,
-                qmin=qmin,
-                qmax=qmax,
-            )
-            self.adapter.init_structures(structure_path)
-            self.adapter.init_contribution()
-            self.adapter.init_recipe()
+            if self._recipe_structure_path != structure_path:
+                # Build the recipe once; CIF parsing and symmetry-constraint
+                # construction are reused for every later profile.
+                self.adapter.init_profile(
+                    str(input_file),
+                    xmin=xmin,
+                    xmax=xmax,
+                    dx=dx,
+                    qmin=qmin,
+                    qmax=qmax,
+                )
+                self.adapter.init_structures(structure_path)
+                self.adapter.init_contribution()
+                self.adapter.init_recipe()
+                self._recipe_structure_path = structure_path
+            else:
+                self.adapter.reset_profile(
+                    str(input_file),
+                    xmin=xmin,
+                    xmax=xmax,
+                    dx=dx,
+                    qmin=qmin,
+                    qmax=qmax,
+                )
             if not hasattr(self, "last_result_variables_values"):
                 self.last_result_variables_values = initial_variable_values
             self.adapter.set_initial_variable_values(
@@ -236,22 +283,49 @@ class SequentialPDFFitRunner:
                     "ydata"
                 ].put(entry_value)
             print(f"Completed processing {input_file.name}.")
+        number_processed = len(self.input_files_running)
         self.input_files_running = []
+        return number_processed
 
     def start(self, mode: Literal["batch", "stream"]):
         if mode == "batch":
             self.start_one_round()
         elif mode == "stream":
+            # Only the interactive stream mode needs prompt_toolkit.
+            from prompt_toolkit import PromptSession
+            from prompt_toolkit.patch_stdout import patch_stdout
+
             stop_event = threading.Event()
             session = PromptSession()
+            file_events = Queue()
+            observer = _start_directory_observer(
+                self.inputs["input_data_dir"], file_events
+            )
             if self.plot_data is not None:
                 plt.ion()
                 plt.pause(0.05)
 
             def stream_loop():
+                idle_rounds = 0
                 while not stop_event.is_set():
-                    self.start_one_round()
-                    stop_event.wait(1)  # Check for new data every 1 second
+                    if self.start_one_round():
+                        idle_rounds = 0
+                    else:
+                        idle_rounds += 1
+                    # Back off exponentially while idle: 0.5s doubling up
+                    # to 30s, reset as soon as a file is processed.
+                    delay = min(30.0, 0.5 * 2**idle_rounds)
+                    if observer is not None:
+                        # Block until a file lands instead of polling the
+                        # directory; the sentinel pushed on STOP wakes us.
+                        try:
+                            file_events.get(timeout=delay)
+                        except Empty:
+                            continue
+                        while not file_events.empty():
+                            file_events.get_nowait()
+                    else:
+                        stop_event.wait(delay)
 
             def input_loop():
                 with patch_stdout():
@@ -262,6 +336,7 @@ class SequentialPDFFitRunner:
                         cmd = session.prompt("> ")
                         if cmd.strip() == "STOP":
                             stop_event.set()
+                            file_events.put(None)
                             print(
                                 "Stopping the streaming sequential toolset..."
                             )
@@ -314,6 +389,10 @@ class SequentialPDFFitRunner:
                 plt.pause(0.05)
             fit_thread.join()
             input_thread.join()
+            if observer is not None:
+                observer.stop()
+                observer.join()
+            self.adapter.close()
         else:
             raise ValueError(f"Unknown mode: {mode}")
 
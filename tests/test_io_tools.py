@@ -0,0 +1,24 @@
+import pytest
+
+from agent_tools import io_tools
+
+
+def test_write_file_safe_skips_existing(tmp_path):
+    file_path = tmp_path / "results.json"
+    file_path.write_text("original")
+    with pytest.warns(UserWarning, match="already exists"):
+        io_tools.write_file(str(file_path), "new content", safe=True)
+    assert file_path.read_text() == "original"
+
+
+def test_write_file_safe_creates_missing(tmp_path):
+    file_path = tmp_path / "results.json"
+    io_tools.write_file(str(file_path), "content", safe=True)
+    assert file_path.read_text() == "content"
+
+
+def test_write_file_overwrites_when_not_safe(tmp_path):
+    file_path = tmp_path / "results.json"
+    file_path.write_text("original")
+    io_tools.write_file(str(file_path), "new content", safe=False)
+    assert file_path.read_text() == "new content"
@@ -0,0 +1,48 @@
+import pytest
+
+from agent_tools.sequential_toolkit import SequentialPDFFitRunner
+
+
+def make_runner(input_data_dir):
+    runner = SequentialPDFFitRunner()
+    runner.load_inputs(
+        input_data_dir=str(input_data_dir),
+        structure_path="unused.cif",
+    )
+    return runner
+
+
+def test_check_for_new_data_sorts_by_order_key(tmp_path):
+    for temperature in [300, 200, 250]:
+        (tmp_path / f"{temperature}K.gr").touch()
+    runner = make_runner(tmp_path)
+    runner.check_for_new_data()
+    assert [f.name for f in runner.input_files_known] == [
+        "200K.gr",
+        "250K.gr",
+        "300K.gr",
+    ]
+    assert runner.input_files_running == runner.input_files_known
+
+
+def test_check_for_new_data_appends_later_files(tmp_path):
+    (tmp_path / "200K.gr").touch()
+    runner = make_runner(tmp_path)
+    runner.check_for_new_data()
+    runner.input_files_completed = list(runner.input_files_known)
+    (tmp_path / "250K.gr").touch()
+    runner.check_for_new_data()
+    assert [f.name for f in runner.input_files_known] == [
+        "200K.gr",
+        "250K.gr",
+    ]
+    assert [f.name for f in runner.input_files_running] == ["250K.gr"]
+
+
+def test_check_for_new_data_rejects_out_of_order_files(tmp_path):
+    (tmp_path / "250K.gr").touch()
+    runner = make_runner(tmp_path)
+    runner.check_for_new_data()
+    (tmp_path / "200K.gr").touch()
+    with pytest.raises(RuntimeError, match="Wrong order"):
+        runner.check_for_new_data()